@@ -16,12 +16,23 @@ import os, sys, json
 import subprocess
 from agents.agent import Agent
 from utils.llm import get_llm_response
-from utils.agent_util import safe_cmd, extract_commands, append_trajectory, TIME_OUT_LABEL, extract_diffs, save_diff_description, DIFF_FENCE, BASH_FENCE, INIT_PROMPT, EDIT_PROMPT, HEAD, DIVIDER, UPDATED
+from utils.agent_util import safe_cmd, extract_commands, append_trajectory, TIME_OUT_LABEL, extract_diffs, save_diff_description, save_json, DIFF_FENCE, BASH_FENCE, INIT_PROMPT, EDIT_PROMPT, HEAD, DIVIDER, UPDATED
 from utils.tools_config import Tools
 from utils.split_cmd import split_cmd_statements
 import re
 import time
 
+# 各语言测试文件的文件名模式，每种语言合成一个正则，只编译一次
+TEST_FILE_PATTERNS = {
+    'python': re.compile(r'^test_.*\.py$|.*_test\.py$'),
+    'node': re.compile(r'.*\.test\.js$|.*\.spec\.js$'),
+    'java': re.compile(r'.*Test\.java$'),
+    'go': re.compile(r'.*_test\.go$'),
+    'rust': re.compile(r'.*_test\.rs$'),
+    'cpp': re.compile(r'.*_test\.cpp$|.*Test\.cpp$'),
+    'csharp': re.compile(r'.*Test\.cs$')
+}
+
 def res_truncate(text):
     keywords = ['''waitinglist command usage error, the following command formats are leagal:
 1. `waitinglist add -p package_name1 -v >=1.0.0 -t pip`
@@ -453,21 +464,9 @@ VERY IMPORTANT TIPS:
 
     def _is_test_file(self, filename):
         """Check if file is a test file across different languages"""
-        test_patterns = {
-            'python': [r'^test_.*\.py$', r'.*_test\.py$'],
-            'node': [r'.*\.test\.js$', r'.*\.spec\.js$'],
-            'java': [r'.*Test\.java$'],
-            'go': [r'.*_test\.go$'],
-            'rust': [r'.*_test\.rs$'],
-            'cpp': [r'.*_test\.cpp$', r'.*Test\.cpp$'],
-            'csharp': [r'.*Test\.cs$']
-        }
-        
-        for lang, patterns in test_patterns.items():
-            if lang in self.detected_languages:
-                for pattern in patterns:
-                    if re.match(pattern, filename):
-                        return True
+        for lang, pattern in TEST_FILE_PATTERNS.items():
+            if lang in self.detected_languages and pattern.match(filename):
+                return True
         return False
 
     def _save_language_and_patch_info(self, waiting_list, conflict_list):
@@ -772,10 +771,8 @@ The edit format is as follows:
             else:
                 system_message = {"role": "user", "content": system_res}
             self.messages.append(system_message)
-            with open(f'{self.root_dir}/output/{self.full_name}/outer_commands.json', 'w') as w1:
-                w1.write(json.dumps(self.outer_commands, indent=4))
-            with open(f'{self.root_dir}/output/{self.full_name}/inner_commands.json', 'w') as w1:
-                w1.write(json.dumps(self.sandbox.commands, indent=4))
+            save_json(f'{self.root_dir}/output/{self.full_name}/outer_commands.json', self.outer_commands)
+            save_json(f'{self.root_dir}/output/{self.full_name}/inner_commands.json', self.sandbox.commands)
             print(system_res)
 
         append_trajectory(trajectory, self.messages, 'configuration')
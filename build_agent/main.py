@@ -14,60 +14,39 @@
 
 
 import argparse
-import json
-import multiprocessing
 import threading
 import time
 import os
-import sys
-from datetime import datetime, timedelta
 from utils.sandbox import Sandbox
 from agents.configuration import Configuration
 import subprocess
 from utils.waiting_list import WaitingList
 from utils.conflict_list import ConflictList
 from utils.integrate_dockerfile import integrate_dockerfile
-import ast
+from utils.agent_util import save_json
 import shutil
 
-def move_files_to_repo(source_folder):
-    # Define target folder path
-    target_folder = os.path.join(source_folder, 'repo_inner_directory_long_long_name_to_avoid_duplicate')
-    
-    # Create target folder if it doesn't exist
-    if not os.path.exists(target_folder):
-        os.mkdir(target_folder)
-    
-    # Move all files except the target folder
-    for item in os.listdir(source_folder):
-        item_path = os.path.join(source_folder, item)
-        
-        if item == 'repo_inner_directory_long_long_name_to_avoid_duplicate':
-            continue
-        
-        shutil.move(item_path, os.path.join(target_folder, item))
-
-    os.rename(target_folder, os.path.join(source_folder, 'repo'))
-
 def setup_local_repo(root_path, local_path, author_name="local", repo_name="repo"):
     """Set up a local repository for processing"""
     target_dir = f'{root_path}/utils/repo/{author_name}/{repo_name}'
     
-    # Create target directory structure
-    os.makedirs(target_dir, exist_ok=True)
-    
-    # Copy local files to target location
-    shutil.copytree(local_path, target_dir, dirs_exist_ok=True)
-    
-    # Move files to repo subdirectory consistently with remote repos
-    move_files_to_repo(target_dir)
+    # Reuse the working copy in place when it is the one being processed,
+    # otherwise wiping target_dir would delete the source before copying it
+    if os.path.exists(f'{target_dir}/repo') and os.path.samefile(local_path, f'{target_dir}/repo'):
+        print(f"Local path '{local_path}' is already the working copy, skip copying it.")
+    else:
+        # Remove existing repo directory if it exists
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        # Copy local files straight into the repo subdirectory, consistently with remote repos
+        shutil.copytree(local_path, f'{target_dir}/repo')
     
     # Create .pipreqs directory and generate requirements if possible
     os.makedirs(f'{target_dir}/repo/.pipreqs', exist_ok=True)
-    pipreqs_cmd = "pipreqs --savepath=.pipreqs/requirements_pipreqs.txt --force"
+    pipreqs_cmd = ['pipreqs', '--savepath=.pipreqs/requirements_pipreqs.txt', '--force']
     try:
         pipreqs_result = subprocess.run(pipreqs_cmd, cwd=f"{target_dir}/repo", 
-                                      capture_output=True, shell=True)
+                                      capture_output=True)
         with open(f'{target_dir}/repo/.pipreqs/pipreqs_output.txt', 'w') as w1:
             w1.write(pipreqs_result.stdout.decode('utf-8'))
         with open(f'{target_dir}/repo/.pipreqs/pipreqs_error.txt', 'w') as w2:
@@ -95,17 +74,21 @@ def download_repo(root_path, full_name, sha):
     if os.path.exists(repo_dir):
         shutil.rmtree(repo_dir)
     
-    # Clone the repository
-    download_cmd = f"git clone https://github.com/{full_name}.git"
-    subprocess.run(download_cmd, cwd=author_dir, check=True, shell=True)
-    move_files_to_repo(f'{root_path}/utils/repo/{author_name}/{repo_name}')
+    # Clone the repository straight into repo/, fetching commits and trees only;
+    # file contents are downloaded on demand when the target sha is checked out
+    download_cmd = ['git', 'clone', '--filter=blob:none', '--no-checkout', f'https://github.com/{full_name}.git', f'{repo_dir}/repo']
+    subprocess.run(download_cmd, check=True)
+    checkout_cmd = ['git', 'checkout', sha]
+    checkout_result = subprocess.run(checkout_cmd, cwd=f'{repo_dir}/repo', capture_output=True)
+    if checkout_result.returncode != 0:
+        # Keep the old behaviour of staying on the default branch when the sha can not be checked out
+        subprocess.run(['git', 'reset', '--hard', 'HEAD'], cwd=f'{repo_dir}/repo', capture_output=True)
     if os.path.exists(f"{root_path}/utils/repo/{author_name}/{repo_name}/repo/Dockerfile") and not os.path.isdir(f"{root_path}/utils/repo/{author_name}/{repo_name}/repo/Dockerfile"):
-        rm_dockerfile_cmd = f"rm -rf {root_path}/utils/repo/{author_name}/{repo_name}/repo/Dockerfile"
-        subprocess.run(rm_dockerfile_cmd, check=True, shell=True)
-    pipreqs_cmd = "pipreqs --savepath=.pipreqs/requirements_pipreqs.txt --force"
-    os.system(f'mkdir {root_path}/utils/repo/{author_name}/{repo_name}/repo/.pipreqs')
+        os.remove(f"{root_path}/utils/repo/{author_name}/{repo_name}/repo/Dockerfile")
+    pipreqs_cmd = ['pipreqs', '--savepath=.pipreqs/requirements_pipreqs.txt', '--force']
+    os.makedirs(f'{root_path}/utils/repo/{author_name}/{repo_name}/repo/.pipreqs', exist_ok=True)
     try:
-        pipreqs_warnings = subprocess.run(pipreqs_cmd, cwd=f"{root_path}/utils/repo/{author_name}/{repo_name}/repo", check=True, shell=True, capture_output=True)
+        pipreqs_warnings = subprocess.run(pipreqs_cmd, cwd=f"{root_path}/utils/repo/{author_name}/{repo_name}/repo", check=True, capture_output=True)
         with open(f'{root_path}/utils/repo/{author_name}/{repo_name}/repo/.pipreqs/pipreqs_output.txt', 'w') as w1:
             w1.write(pipreqs_warnings.stdout.decode('utf-8'))
         with open(f'{root_path}/utils/repo/{author_name}/{repo_name}/repo/.pipreqs/pipreqs_error.txt', 'w') as w2:
@@ -113,9 +96,6 @@ def download_repo(root_path, full_name, sha):
     except:
         pass
 
-    checkout_cmd = f"git checkout {sha}"
-    subprocess.run(checkout_cmd, cwd=f'{root_path}/utils/repo/{author_name}/{repo_name}/repo', capture_output=True, shell=True)
-
     # x = subprocess.run('git log -1 --format="%H"', cwd=f'{root_path}/utils/repo/{author_name}/{repo_name}/repo', capture_output=True, shell=True)
     with open(f'{root_path}/utils/repo/{author_name}/{repo_name}/sha.txt', 'w') as w1:
         w1.write(sha)
@@ -142,6 +122,16 @@ def main():
     if not os.path.isabs(root_path):
         root_path = os.path.abspath(root_path)
 
+    def timer():
+        time.sleep(3600*2)  # Wait for 2h
+        print("Timeout for 2 hour!")
+        os._exit(1)  # Force exit program
+
+    # Start timer thread before fetching the repo, so a hung clone is bounded too
+    timer_thread = threading.Thread(target=timer)
+    timer_thread.daemon = True
+    timer_thread.start()
+
     if args.repo:
         full_name, sha = args.repo
         if len(full_name.split('/')) != 2:
@@ -163,32 +153,8 @@ def main():
     
     # Create or clean output directory
     if os.path.exists(f'{output_path}/patch'):
-        rm_cmd = f"rm -rf {output_path}/patch"
-        subprocess.run(rm_cmd, shell=True, check=True)
-    if not os.path.exists(output_path):
-        subprocess.run(f'mkdir -p {output_path}', shell=True)
-
-    # Setup or clean repo directory
-    repo_dir = f'{root_path}/utils/repo/{repo_path}'
-    if os.path.exists(repo_dir):
-        init_cmd = f"rm -rf {repo_dir} && mkdir -p {repo_dir}"
-    else:
-        init_cmd = f"mkdir -p {repo_dir}"
-    subprocess.run(init_cmd, check=True, shell=True)
-    
-    def timer():
-        time.sleep(3600*2)  # Wait for 2h
-        print("Timeout for 2 hour!")
-        os._exit(1)  # Force exit program
-
-    # Start timer thread
-    timer_thread = threading.Thread(target=timer)
-    timer_thread.daemon = True
-    timer_thread.start()
-
-    # Setup repository (either download or copy local)
-    if args.repo:
-        download_repo(root_path, args.repo[0], args.repo[1])
+        shutil.rmtree(f'{output_path}/patch')
+    os.makedirs(output_path, exist_ok=True)
 
     trajectory = []
 
@@ -198,13 +164,10 @@ def main():
     msg, outer_commands = configuration_agent.run('/tmp', trajectory, waiting_list, conflict_list)
     
     # Save outputs
-    with open(f'{output_path}/track.json', 'w') as w1:
-        w1.write(json.dumps(msg, indent=4))
+    save_json(f'{output_path}/track.json', msg)
     commands = configuration_sandbox.stop_container()
-    with open(f'{output_path}/inner_commands.json', 'w') as w2:
-        w2.write(json.dumps(commands, indent=4))
-    with open(f'{output_path}/outer_commands.json', 'w') as w3:
-        w3.write(json.dumps(outer_commands, indent=4))
+    save_json(f'{output_path}/inner_commands.json', commands)
+    save_json(f'{output_path}/outer_commands.json', outer_commands)
     
     try:
         integrate_dockerfile(f'{output_path}')
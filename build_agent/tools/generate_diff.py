@@ -14,10 +14,17 @@
 
 
 import subprocess
+import shutil
+import sys
 
 def generate_diff():
-    subprocess.run('git --no-pager diff > final_patch.diff', cwd='/repo', shell=True, check=True)
-    subprocess.run('cat final_patch.diff', cwd='/repo', shell=True)
+    with open('/repo/final_patch.diff', 'w') as file:
+        subprocess.run(['git', '--no-pager', 'diff'], cwd='/repo', stdout=file, check=True)
+    # 直接按字节输出patch内容，不再起cat子进程，输出和文件完全一致
+    sys.stdout.flush()
+    with open('/repo/final_patch.diff', 'rb') as file:
+        shutil.copyfileobj(file, sys.stdout.buffer)
+    sys.stdout.buffer.flush()
 
 if __name__ == '__main__':
     generate_diff()
\ No newline at end of file
@@ -40,29 +40,26 @@ def run_go_tests():
         
         # Parse JSON output
         tests = []
-        total_tests = 0
-        passed_tests = 0
-        failed_tests = 0
-        skipped_tests = 0
+        counts = {'run': 0, 'pass': 0, 'fail': 0, 'skip': 0}
         total_time = 0.0
         
         for line in result.stdout.splitlines():
             try:
                 test_result = json.loads(line)
-                if test_result.get('Action') == 'run':
-                    total_tests += 1
-                elif test_result.get('Action') == 'pass':
-                    passed_tests += 1
-                elif test_result.get('Action') == 'fail':
-                    failed_tests += 1
-                    tests.append(test_result)
-                elif test_result.get('Action') == 'skip':
-                    skipped_tests += 1
+                action = test_result.get('Action')
+                if action in counts:
+                    counts[action] += 1
+                    if action == 'fail':
+                        tests.append(test_result)
                 
                 if 'Elapsed' in test_result:
                     total_time += float(test_result['Elapsed'])
             except json.JSONDecodeError:
                 continue
+        total_tests = counts['run']
+        passed_tests = counts['pass']
+        failed_tests = counts['fail']
+        skipped_tests = counts['skip']
 
         # Print test summary
         print("\nTest Summary:")
@@ -25,12 +25,13 @@ def run_pip(package_name, version_constraints):
         full_name = package_name
     else:
         full_name = package_name + version_constraints
+    # 和PATH中的pytest用同一个pip，参数直接传入不经过shell，引号只用于输出
+    pip_command = ['pip', 'install', '--prefer-binary', full_name.strip().strip('"\'')]
     if not full_name.strip().startswith('"') or not full_name.strip().startswith("'"):
         full_name = '"' + full_name + '"'
-    pip_command = 'pip install ' + full_name
     try:
         # 执行pip指令
-        result = subprocess.run(pip_command, shell=True, check=True, text=True, capture_output=True)
+        result = subprocess.run(pip_command, check=True, text=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
         # 检查返回码以确定是否安装成功
         if result.returncode == 0:
@@ -44,13 +45,36 @@ def run_pip(package_name, version_constraints):
         print("An error occurred while running pip:\n", e.stderr.strip())
         return False
 
+# 一次pip install装多个包，让pip统一解析依赖
+def run_pip_batch(requirements):
+    full_names = ' '.join('"' + requirement + '"' for requirement in requirements)
+    pip_command = ['pip', 'install', '--prefer-binary'] + list(requirements)
+    try:
+        result = subprocess.run(pip_command, check=True, text=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        if result.returncode == 0:
+            print(f"The packages {full_names} were installed successfully.")
+            return True
+        else:
+            print(f"Failed to install the packages {full_names}.")
+            return False
+    except subprocess.CalledProcessError as e:
+        print("An error occurred while running pip:\n", e.stderr.strip())
+        return False
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Install a Python package with pip.')
-    parser.add_argument('-p', '--package_name', required=True, type=str, help='The name of the package to install.')
+    parser.add_argument('-p', '--package_name', type=str, help='The name of the package to install.')
     parser.add_argument('-v', '--version_constraints', type=str, default='', nargs='?', help='The version constraints of the package.')
+    parser.add_argument('-b', '--batch', type=str, nargs='+', help='Install several <package_name><version_constraints> entries in one pip call.')
     args = parser.parse_args()
+    if not args.batch and not args.package_name:
+        parser.error('one of the arguments -p/--package_name -b/--batch is required')
 
-    success = run_pip(args.package_name, args.version_constraints)
+    if args.batch:
+        success = run_pip_batch(args.batch)
+    else:
+        success = run_pip(args.package_name, args.version_constraints)
     # print(success)
     if not success:
         sys.exit(1)
@@ -22,55 +22,46 @@ import sys
 import os
 warnings.simplefilter('ignore', FutureWarning)
 import re
+from runtest import repo_has_tests, print_test_func, collect_tests
+
+# 用正则表达式匹配测试用例
+TEST_CASE_PATTERN = re.compile(r'^(tests/[\w/]+\.py::[\w_]+)$', re.MULTILINE)
 
 def extract_test_cases(file_path):
-    # 用正则表达式匹配测试用例
-    test_case_pattern = re.compile(r'^(tests/[\w/]+\.py::[\w_]+)$', re.MULTILINE)
-    
     test_cases = []
     try:
         with open(file_path, 'r') as file:
             content = file.read()
-            test_cases = test_case_pattern.findall(content)
+            test_cases = TEST_CASE_PATTERN.findall(content)
     except FileNotFoundError:
         print(f"File {file_path} not found.")
         return []
     
     return test_cases
 
-def check_pytest():
-    result = subprocess.run('pytest --version', shell=True, text=True, capture_output=True)
-    if result.returncode == 0:
-        return True
-    else:
-        return False
-
 def run_pytest():
-    success = check_pytest()
-    if not success:
-        print('Pytest is not installed in your environment. Please install the latest version of pytest using `pip install pytest`.')
-        sys.exit(100)
+    if not repo_has_tests('/repo'):
+        print('No unit tests were detected in this repository, so it passes. Congratulations, you have successfully configured the environment!')
+        sys.exit(5)
     # if not os.path.exists('/home/tools/.test_func'):
     try:
-        with open('/home/tools/.test_func', 'w') as file:
-            # 使用subprocess.run并传递标准输出和标准错误到文件
-            result = subprocess.run(
-                # ['poetry', 'run', 'pytest', '/repo', '--collect-only', '-q', '--disable-warnings'],
-                ['poetry', 'run', 'pytest', '--collect-only', '-q', '--disable-warnings'],
-                cwd='/repo',
-                stdout=file,
-                stderr=subprocess.STDOUT  # 将标准错误重定向到标准输出
-            )
+        # result = collect_tests(['poetry', 'run', 'pytest', '/repo', '--collect-only', '-q', '--disable-warnings'])
+        result = collect_tests(['poetry', 'run', 'pytest', '--collect-only', '-q', '--disable-warnings', '--assert=plain'])
         if result.returncode == 5:
             print('No unit tests were detected in this repository, so it passes. Congratulations, you have successfully configured the environment!')
             sys.exit(5)
         if result.returncode != 0:
+            # 不再单独跑pytest --version，poetry找不到pytest时会报Command not found
+            with open('/home/tools/.test_func', 'r', errors='ignore') as file:
+                if 'Command not found: pytest' in file.read():
+                    print('Pytest is not installed in your environment. Please install the latest version of pytest using `pip install pytest`.')
+                    sys.exit(100)
             print('Error: Please modify the configuration according to the error messages below. Once all issues are resolved, rerun the tests.')
-            subprocess.run('cat /home/tools/.test_func', shell=True)
+            print_test_func()
             sys.exit(result.returncode)
         else:
             print('Congratulations, you have successfully configured the environment!')
-            subprocess.run('cat /home/tools/.test_func', shell=True)
+            print_test_func()
             # print()
             # try:
             #     subprocess.run('pipdeptree', shell=True)
@@ -85,7 +76,8 @@ def run_pytest():
 
     except Exception as e:
         print(e)
-        subprocess.run('rm -rf /home/tools/.test_func', shell=True)
+        if os.path.exists('/home/tools/.test_func'):
+            os.remove('/home/tools/.test_func')
         print('Error: Please modify the configuration according to the error messages below. Once all issues are resolved, rerun the tests.')
         sys.exit(200)
 
@@ -14,11 +14,11 @@
 
 
 #!/usr/bin/env python3
-import subprocess
 import argparse
 import warnings
 import sys
 import os
+import shutil
 warnings.simplefilter('ignore', FutureWarning)
 
 def runpipreqs():
@@ -27,10 +27,11 @@ def runpipreqs():
     elif not os.path.exists('/repo/.pipreqs') or not os.path.exists('/repo/.pipreqs/pipreqs_error.txt') or not os.path.exists('/repo/.pipreqs/pipreqs_output.txt') or not os.path.exists('/repo/.pipreqs/requirements_pipreqs.txt'):
         raise Exception("The previous program encountered an error. Please use `pip install pipreqs` to generate 'requirements_pipreqs.txt' yourself.")
     else:
-        result1 = subprocess.run('cp /repo/.pipreqs/pipreqs_error.txt /repo', shell=True, text=True, capture_output=True)
-        result2 = subprocess.run('cp /repo/.pipreqs/pipreqs_output.txt /repo', shell=True, text=True, capture_output=True)
-        result3 = subprocess.run('cp /repo/.pipreqs/requirements_pipreqs.txt /repo', shell=True, text=True, capture_output=True)
-        if result1.returncode != 0 or result2.returncode != 0 or result3.returncode != 0:
+        # 进程内直接拷贝，不再为每个文件起一个cp
+        try:
+            for file_name in ['pipreqs_error.txt', 'pipreqs_output.txt', 'requirements_pipreqs.txt']:
+                shutil.copy(f'/repo/.pipreqs/{file_name}', '/repo')
+        except OSError:
             raise Exception("The previous program encountered an error. Please use `pip install pipreqs` to generate 'requirements_pipreqs.txt' yourself.")
         else:
             print('The runpipreqs command executed successfully and has successfully generated "requirements_pipreqs.txt", "pipreqs_output.txt", and "pipreqs_error.txt" in /repo.')
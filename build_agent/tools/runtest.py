@@ -22,55 +22,151 @@ import sys
 import os
 warnings.simplefilter('ignore', FutureWarning)
 import re
+import shutil
+
+# 用正则表达式匹配测试用例
+TEST_CASE_PATTERN = re.compile(r'^(tests/[\w/]+\.py::[\w_]+)$', re.MULTILINE)
 
 def extract_test_cases(file_path):
-    # 用正则表达式匹配测试用例
-    test_case_pattern = re.compile(r'^(tests/[\w/]+\.py::[\w_]+)$', re.MULTILINE)
-    
     test_cases = []
     try:
         with open(file_path, 'r') as file:
             content = file.read()
-            test_cases = test_case_pattern.findall(content)
+            test_cases = TEST_CASE_PATTERN.findall(content)
     except FileNotFoundError:
         print(f"File {file_path} not found.")
         return []
     
     return test_cases
 
-def check_pytest():
-    result = subprocess.run('pytest --version', shell=True, text=True, capture_output=True)
-    if result.returncode == 0:
-        return True
-    else:
-        return False
+# 这些配置项会改变pytest的默认收集规则，出现时交给pytest自己判断
+PYTEST_CONFIG_FILES = ['pytest.ini', '.pytest.ini', 'tox.ini', 'setup.cfg', 'pyproject.toml']
+CUSTOM_COLLECT_KEYS = ['python_files', 'doctest', 'norecursedirs', 'collect-in-virtualenv']
+# pytest默认的norecursedirs，pytest不会进这些目录收集测试
+PYTEST_NORECURSE_DIRS = {'_darcs', 'build', 'CVS', 'dist', 'node_modules', 'venv', '{arch}'}
+
+def repo_has_tests(repo_dir):
+    for config_file in PYTEST_CONFIG_FILES:
+        try:
+            with open(os.path.join(repo_dir, config_file), 'r', errors='ignore') as file:
+                content = file.read()
+        except OSError:
+            continue
+        if any(key in content for key in CUSTOM_COLLECT_KEYS):
+            return True
+    # 用os.scandir手动遍历，找到第一个符合pytest默认命名的测试文件就返回
+    # 栈里存(路径, 真实路径)，和pytest一样跟随目录软链接，用真实路径防止软链接成环
+    stack = [(repo_dir, os.path.realpath(repo_dir))]
+    seen_links = set()
+    while stack:
+        current_dir, current_real = stack.pop()
+        try:
+            entries = os.scandir(current_dir)
+        except OSError:
+            continue
+        subdirs = []
+        found = False
+        is_venv = False
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir():
+                    if name.startswith('.') or name.endswith('.egg') or name in PYTEST_NORECURSE_DIRS:
+                        continue
+                    if entry.is_symlink():
+                        real = os.path.realpath(entry.path)
+                        # 指向祖先目录或已经走过的目标就不再进入
+                        if real in seen_links or current_real == real or current_real.startswith(real + os.sep):
+                            continue
+                        seen_links.add(real)
+                    else:
+                        real = os.path.join(current_real, name)
+                    subdirs.append((entry.path, real))
+                elif name == 'pyvenv.cfg':
+                    is_venv = True
+                elif name == 'conftest.py':
+                    found = True
+                elif name.endswith('.py') and (name.startswith('test_') or name.endswith('_test.py')):
+                    found = True
+        # 和pytest一样跳过虚拟环境目录（带pyvenv.cfg），不管它叫什么名字
+        if is_venv and current_dir != repo_dir:
+            continue
+        if found:
+            return True
+        stack.extend(subdirs)
+    return False
+
+# 收集时用不到缓存插件，关掉它省掉读写.pytest_cache；配置里用到缓存相关选项时保留
+CACHE_OPTIONS = ['--lf', '--last-failed', '--ff', '--failed-first', '--nf', '--new-first', '--sw', '--stepwise', '--cache', 'cacheprovider']
+
+def collect_plugin_args(repo_dir):
+    for config_file in PYTEST_CONFIG_FILES:
+        try:
+            with open(os.path.join(repo_dir, config_file), 'r', errors='ignore') as file:
+                content = file.read()
+        except OSError:
+            continue
+        if any(option in content for option in CACHE_OPTIONS):
+            return []
+    return ['-p', 'no:cacheprovider']
+
+# 有的插件（如pytest-flake8）在configure时就用config.cache，关掉cacheprovider会报这个错
+CACHE_ERROR = "has no attribute 'cache'"
+
+def run_collect(command):
+    with open('/home/tools/.test_func', 'w') as file:
+        # 使用subprocess.run并传递标准输出和标准错误到文件
+        return subprocess.run(
+            command,
+            cwd='/repo',
+            # 只收集不运行，不需要写.pyc
+            env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'),
+            stdout=file,
+            stderr=subprocess.STDOUT  # 将标准错误重定向到标准输出
+        )
+
+# 先关掉cacheprovider收集，因此失败时去掉该参数重新收集一次，和正常跑pytest的结果保持一致
+def collect_tests(command):
+    plugin_args = collect_plugin_args('/repo')
+    result = run_collect(command + plugin_args)
+    if result.returncode not in (0, 5) and plugin_args:
+        with open('/home/tools/.test_func', 'r', errors='ignore') as file:
+            cache_error = CACHE_ERROR in file.read()
+        if cache_error:
+            result = run_collect(command)
+    return result
+
+# 直接在进程内输出收集结果，不再起cat子进程
+def print_test_func():
+    # 按字节原样输出，和cat一致，不受stdout编码影响
+    sys.stdout.flush()
+    with open('/home/tools/.test_func', 'rb') as file:
+        shutil.copyfileobj(file, sys.stdout.buffer)
+    sys.stdout.buffer.flush()
 
 def run_pytest():
-    success = check_pytest()
-    if not success:
+    if not repo_has_tests('/repo'):
+        print('No unit tests were detected in this repository, so it passes. Congratulations, you have successfully configured the environment!')
+        sys.exit(5)
+    # 在PATH中找一次pytest，找不到就说明没有安装，用绝对路径运行
+    pytest_path = shutil.which('pytest')
+    if pytest_path is None:
         print('Pytest is not installed in your environment. Please install the latest version of pytest using `pip install pytest`.')
         sys.exit(100)
     # if not os.path.exists('/home/tools/.test_func'):
     try:
-        with open('/home/tools/.test_func', 'w') as file:
-            # 使用subprocess.run并传递标准输出和标准错误到文件
-            result = subprocess.run(
-                # ['pytest', '/repo', '--collect-only', '-q', '--disable-warnings'],
-                ['pytest', '--collect-only', '-q', '--disable-warnings'],
-                cwd='/repo',
-                stdout=file,
-                stderr=subprocess.STDOUT  # 将标准错误重定向到标准输出
-            )
+        # result = collect_tests(['pytest', '/repo', '--collect-only', '-q', '--disable-warnings'])
+        result = collect_tests([pytest_path, '--collect-only', '-q', '--disable-warnings', '--assert=plain'])
         if result.returncode == 5:
             print('No unit tests were detected in this repository, so it passes. Congratulations, you have successfully configured the environment!')
             sys.exit(5)
         if result.returncode != 0:
             print('Error: Please modify the configuration according to the error messages below. Once all issues are resolved, rerun the tests.')
-            subprocess.run('cat /home/tools/.test_func', shell=True)
+            print_test_func()
             sys.exit(result.returncode)
         else:
             print('Congratulations, you have successfully configured the environment!')
-            subprocess.run('cat /home/tools/.test_func', shell=True)
+            print_test_func()
             # print()
             # try:
             #     subprocess.run('pipdeptree', shell=True)
@@ -85,7 +181,8 @@ def run_pytest():
             
     except Exception as e:
         print(e)
-        subprocess.run('rm -rf /home/tools/.test_func', shell=True)
+        if os.path.exists('/home/tools/.test_func'):
+            os.remove('/home/tools/.test_func')
         print('Error: Please modify the configuration according to the error messages below. Once all issues are resolved, rerun the tests.')
         sys.exit(200)
 
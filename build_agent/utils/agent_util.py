@@ -179,6 +179,18 @@ def save_score(id, score_path, raw_score, agent_score):
     with open(os.path.join(score_path, 'score.jsonl'), 'a') as file:
         file.write(json.dumps(item) + '\n')
 
+def save_json(path, data):
+    # 先写临时文件再替换，读的一方不会看到写了一半的json
+    tmp_path = f'{path}.tmp'
+    try:
+        file = open(tmp_path, 'w')
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file = open(tmp_path, 'w')
+    with file:
+        file.write(json.dumps(data, indent=4))
+    os.replace(tmp_path, path)
+
 def extract_diffs(text):
     pattern = rf'{DIFF_FENCE[0]}([\s\S]*?){DIFF_FENCE[1]}'
     matches = re.findall(pattern, text)
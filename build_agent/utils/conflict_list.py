@@ -23,14 +23,11 @@ class ConflictListItem:
         self.tool = tool
 
     def add_constraints(self, extra_constraints):
-        original_length = len(self.version_constraints)
-        self.version_constraints.append(extra_constraints)
-        # 如果有几种constraints，则去重并随机排
-        self.version_constraints = list(set(self.version_constraints))
-        now_length = len(self.version_constraints)
-        if original_length == now_length:
+        # constraints保持去重，按加入顺序排
+        if extra_constraints in self.version_constraints:
             print(f"The version constraint '{extra_constraints}' you want to add is redundant; it already exists in the '{self.package_name}'(using {self.tool} to download) of the conflict list.")
         else:
+            self.version_constraints.append(extra_constraints)
             print(f"The version constraint '{extra_constraints}' has been successfully added into conflict list, serving as a potential version constraint for package '{self.package_name}'(using {self.tool} to download).")
 
 
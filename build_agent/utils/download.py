@@ -16,14 +16,67 @@
 # from apt_download import run_apt
 # from pip_download import run_pip
 import subprocess
+import pexpect
 
 TIME_OUT_LABEL= ' seconds. Partial output:'
 
+TIMEOUT_MARKERS = ('timeout', 'timed out', 'failed to fetch', 'could not resolve')
+
 def match_timeout(text):
-    if 'timeout' in text.lower() or 'timed out' in text.lower() or 'failed to fetch' in text.lower() or 'could not resolve' in text.lower():
-        return True
-    else:
+    # 只转一次小写，命中第一个标记就返回
+    text = text.lower()
+    return any(marker in text for marker in TIMEOUT_MARKERS)
+
+def pip_spec(item):
+    return f'{item.package_name}{item.version_constraints if item.version_constraints else ""}'
+
+# 一组包的超时按包数放大，和原来逐个下载时每个包各有600秒一致，
+# 但最多PIP_BATCH_MAX_TIMEOUT，不能让一个卡住的包拖到main.py的整体超时
+PIP_TIMEOUT = 600
+PIP_BATCH_MAX_TIMEOUT = PIP_TIMEOUT * 2
+# 小于这个大小的组不再合并安装，交给后面的逐个下载
+PIP_BATCH_MIN_SIZE = 4
+# 每组失败都会回滚一次容器，失败次数到上限就停止二分，剩下的全部逐个下载
+PIP_BATCH_MAX_FAILURES = 2
+
+# 一次pip install装一组包；超时也算这组失败，回滚容器并重开shell，避免pip还在旧shell里跑
+def download_pip_chunk(session, items):
+    command = 'python /home/tools/pip_download.py -b ' + ' '.join(f'"{pip_spec(item)}"' for item in items)
+    try:
+        success, result = session.execute_simple(command, timeout=min(PIP_TIMEOUT * len(items), PIP_BATCH_MAX_TIMEOUT))
+    except pexpect.TIMEOUT:
+        print(f'Downloading {len(items)} pip packages together timed out.')
+        session.sandbox.switch_to_pre_image()
         return False
+    return success
+
+# 把waiting list中的pip条目合成一次pip install，依赖只解析一次
+# 整组失败时二分重试：k个出错的包最多要约2k*log(N)次调用，每次失败都要回滚容器，
+# 所以二分到PIP_BATCH_MIN_SIZE或失败PIP_BATCH_MAX_FAILURES次就停，剩下的交给逐个下载，保留原有的超时/报错计数
+# 已经单独下载失败过的包直接逐个下载，不再参与下一轮的合并安装
+def download_pip_batch(session, waiting_list):
+    pip_items = [item for item in waiting_list.items if item.tool.strip().lower() == 'pip' and item.timeouterror == 0 and item.othererror == 0]
+    installed_items = list()
+    failures = 0
+    chunks = [pip_items]
+    while chunks and failures < PIP_BATCH_MAX_FAILURES:
+        chunk = chunks.pop()
+        if len(chunk) < PIP_BATCH_MIN_SIZE:
+            continue
+        if download_pip_chunk(session, chunk):
+            installed_items.extend(chunk)
+        else:
+            failures += 1
+            mid = len(chunk) // 2
+            # 先装前半组
+            chunks.append(chunk[mid:])
+            chunks.append(chunk[:mid])
+    if len(installed_items) < len(pip_items) and len(pip_items) >= PIP_BATCH_MIN_SIZE:
+        print('Some pip packages could not be downloaded together, so they will be downloaded one by one to find the failing ones.')
+    for item in installed_items:
+        waiting_list.remove(item)
+        print(f'"{pip_spec(item)}" installed successfully.')
+    return installed_items
 
 def download(session, waiting_list, conflict_list):
     successful_download = list()
@@ -37,6 +90,9 @@ def download(session, waiting_list, conflict_list):
         return -1
     if waiting_list.size() == 0:
         print('The waiting list is empty. There are currently no items to download. Please perform other operations.')
+    # pip包可能要编译依赖apt装的开发库，waiting list里有apt条目时按原顺序逐个下载，不合并pip
+    if not any(item.tool.strip().lower() == 'apt' for item in waiting_list.items):
+        successful_download.extend(download_pip_batch(session, waiting_list))
     while waiting_list.size() > 0:
         pop_item = waiting_list.pop()
         success = False
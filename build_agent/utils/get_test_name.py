@@ -15,19 +15,15 @@
 
 import subprocess
 import re
+
+TEST_CASE_PATTERN = re.compile(r'^[^\[\n]+', re.MULTILINE)
+
 def collect_test_cases(file_content):
-    lines = file_content.strip().split('\n')
-    lines = lines[:-2]
-    test_cases = []
-    
-    pattern = re.compile(r'^[^\[]+')
-
-    for line in lines:
-        match = pattern.match(line)
-        if match:
-            test_case = match.group()
-            if test_case not in test_cases:
-                test_cases.append(test_case)
+    # 去掉最后两行的统计信息，剩下的内容用一次findall取出所有测试用例
+    parts = file_content.strip().rsplit('\n', 2)
+    content = parts[0] if len(parts) == 3 else ''
+    # 参数化用例去掉[...]后会重复，用dict按出现顺序去重
+    test_cases = list(dict.fromkeys(TEST_CASE_PATTERN.findall(content)))
     
     return test_cases
 
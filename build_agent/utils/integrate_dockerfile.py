@@ -36,13 +36,14 @@ def find_package_version(package_name, dependencies):
             return sub_version
     return None
 
+PACKAGE_INFO_PATTERN = re.compile(r'(?P<package_name>^[^=<>!~]+)(?P<version_constraints>.*)')
+
 # 用于提取package_name
 def extract_package_info(package_with_constraints):
     """
     从形式如 'requests==2.25.1' 的字符串中提取 package_name 和 version_constraints
     """
-    pattern = re.compile(r'(?P<package_name>^[^=<>!~]+)(?P<version_constraints>.*)')
-    match = pattern.match(package_with_constraints)
+    match = PACKAGE_INFO_PATTERN.match(package_with_constraints)
     
     if not match:
         raise ValueError(f"Invalid package string: {package_with_constraints}")
@@ -61,8 +62,9 @@ def parse_arguments(command):
     args = shlex.split(command)
     # 创建解析器
     parser = argparse.ArgumentParser(description='Install a Python package with pip.')
-    parser.add_argument('-p', '--package_name', required=True, type=str, help='The name of the package to install.')
+    parser.add_argument('-p', '--package_name', type=str, help='The name of the package to install.')
     parser.add_argument('-v', '--version_constraints', type=str, default='', nargs='?', help='The version constraints of the package.')
+    parser.add_argument('-b', '--batch', type=str, nargs='+', help='Install several <package_name><version_constraints> entries in one pip call.')
     # 解析分割后的参数
     parsed_args = parser.parse_args(args[2:])  # 跳过第一个参数（脚本名）
     return parsed_args
@@ -238,6 +240,16 @@ def generate_statement(inner_command, pipdeptree_data):
         # print(command)
         args = parse_arguments(command)
         # print(args.package_name)
+        if args.batch:
+            requirements = list()
+            for requirement in args.batch:
+                package_name = extract_package_info(requirement)
+                package_version = find_package_version(package_name, pipdeptree_data)
+                if package_version is not None:
+                    requirements.append(f'{package_name}=={package_version}')
+            if len(requirements) == 0:
+                return -1
+            return f'RUN pip install {" ".join(requirements)}'
         package_name = args.package_name
         package_version = find_package_version(package_name, pipdeptree_data)
         if package_version is None:
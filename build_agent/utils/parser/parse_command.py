@@ -17,10 +17,11 @@ import re
 from .parse_dialogue import extract_dialogue_warnings
 
 BASH_FENCE = ['```bash', '```']
+BASH_BLOCK_PATTERN = re.compile(rf'{BASH_FENCE[0]}([\s\S]*?){BASH_FENCE[1]}')
+WHITESPACE_PATTERN = re.compile(r'\s+')
 
 def extract_commands(text):
-    pattern = rf'{BASH_FENCE[0]}([\s\S]*?){BASH_FENCE[1]}'
-    matches = re.findall(pattern, text)
+    matches = BASH_BLOCK_PATTERN.findall(text)
 
     commands = []
     for command_text in matches:
@@ -50,41 +51,41 @@ Please regenerate to ensure that the Action part contains exactly one command su
     else:
         return -1
 
+DOWNLOAD_PATTERN = re.compile(r'^\s*download\s*$', re.IGNORECASE | re.MULTILINE)
+
 # 匹配`download`指令，如果是这个指令，则返回True，否则返回False
 def match_download(text):
-    # 正则表达式
-    pattern = re.compile(r'^\s*download\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(text)
+    match = DOWNLOAD_PATTERN.match(text)
     return bool(match)
 
+RUNPIPREQS_PATTERN = re.compile(r'^\s*runpipreqs\s*$', re.IGNORECASE | re.MULTILINE)
+
 # 匹配`runpipreqs`指令，如果是这个指令，则返回True，否则返回False
 def match_runpipreqs(text):
-    # 正则表达式
-    pattern = re.compile(r'^\s*runpipreqs\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(text)
+    match = RUNPIPREQS_PATTERN.match(text)
     return bool(match)
 
+RUNTEST_PATTERN = re.compile(r'^\s*runtest\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_runtest(text):
-    # 正则表达式
-    pattern = re.compile(r'^\s*runtest\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(text)
+    match = RUNTEST_PATTERN.match(text)
     return bool(match)
 
+POETRYRUNTEST_PATTERN = re.compile(r'^\s*poetryruntest\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_poetryruntest(text):
-    # 正则表达式
-    pattern = re.compile(r'^\s*poetryruntest\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(text)
+    match = POETRYRUNTEST_PATTERN.match(text)
     return bool(match)
 
+# 正则表达式模式
+CONFLICT_SOLVE_PATTERN = re.compile(
+    # r'\s*conflictlist\s+solve\s*(?:(-v| -V)\s*["\']([<>=!]=?\d+\.\d+)["\']\s*|\s*(-u\s*))?',
+    r'\s*conflictlist\s+solve\s*(?:(-v| -V)\s*["\']([<>=!]=?\d+(\.\d+)*?)["\']\s*|\s*(-u\s*))?',
+    re.IGNORECASE
+)
+
 def match_conflict_solve(text):
-    # 正则表达式模式
-    pattern = re.compile(
-        # r'\s*conflictlist\s+solve\s*(?:(-v| -V)\s*["\']([<>=!]=?\d+\.\d+)["\']\s*|\s*(-u\s*))?',
-        r'\s*conflictlist\s+solve\s*(?:(-v| -V)\s*["\']([<>=!]=?\d+(\.\d+)*?)["\']\s*|\s*(-u\s*))?',
-        re.IGNORECASE
-    )
-    
-    match = pattern.fullmatch(text.strip())
+    match = CONFLICT_SOLVE_PATTERN.fullmatch(text.strip())
     
     if not match:
         return -1
@@ -126,15 +127,15 @@ def match_conflict_solve(text):
 
 #     return args
 
+# Define the pattern to match the command format
+WAITINGLIST_ADD_PATTERN = re.compile(r"waitinglist add -p ([^\s]+)( -v ([^\s]+))? -t ([^\s]+)")
+
 def match_waitinglist_add(command):
     # Normalize the command by converting to lowercase and removing extra spaces
-    command = re.sub(r'\s+', ' ', command.strip().lower())
-    
-    # Define the pattern to match the command format
-    pattern = r"waitinglist add -p ([^\s]+)( -v ([^\s]+))? -t ([^\s]+)"
+    command = WHITESPACE_PATTERN.sub(' ', command.strip().lower())
     
     # Match the command against the pattern
-    match = re.match(pattern, command)
+    match = WAITINGLIST_ADD_PATTERN.match(command)
     
     if match:
         # Extract package_name, version_constraints, and tool
@@ -149,15 +150,15 @@ def match_waitinglist_add(command):
     else:
         return -1
 
+# Define the pattern to match the command format
+WAITINGLIST_ADDFILE_PATTERN = re.compile(r"waitinglist addfile ([^\s]+)")
+
 def match_waitinglist_addfile(command):
     # Normalize the command by converting to lowercase and removing extra spaces
-    command = re.sub(r'\s+', ' ', command.strip().lower())
-    
-    # Define the pattern to match the command format
-    pattern = r"waitinglist addfile ([^\s]+)"
+    command = WHITESPACE_PATTERN.sub(' ', command.strip().lower())
     
     # Match the command against the pattern
-    match = re.match(pattern, command)
+    match = WAITINGLIST_ADDFILE_PATTERN.match(command)
     
     if match:
         # Extract file_path
@@ -168,14 +169,16 @@ def match_waitinglist_addfile(command):
     else:
         return -1
 
+WAITINGLIST_SHOW_PATTERN = re.compile(r'^\s*waitinglist show\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_waitinglist_show(command):
-    pattern = re.compile(r'^\s*waitinglist show\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = WAITINGLIST_SHOW_PATTERN.match(command)
     return bool(match)
 
+WAITINGLIST_CLEAR_PATTERN = re.compile(r'^\s*waitinglist clear\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_waitinglist_clear(command):
-    pattern = re.compile(r'^\s*waitinglist clear\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = WAITINGLIST_CLEAR_PATTERN.match(command)
     return bool(match)
 
 # def match_errorformatlist_clear(command):
@@ -183,100 +186,119 @@ def match_waitinglist_clear(command):
 #     match = pattern.match(command)
 #     return bool(match)
 
+CONFLICTLIST_SHOW_PATTERN = re.compile(r'^\s*conflictlist show\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_conflictlist_show(command):
-    pattern = re.compile(r'^\s*conflictlist show\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CONFLICTLIST_SHOW_PATTERN.match(command)
     return bool(match)
 
+CONFLICTLIST_CLEAR_PATTERN = re.compile(r'^\s*conflictlist clear\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_conflictlist_clear(command):
-    pattern = re.compile(r'^\s*conflictlist clear\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CONFLICTLIST_CLEAR_PATTERN.match(command)
     return bool(match)
 
+CLEAR_CONFIGURATION_PATTERN = re.compile(r'^\s*clear_configuration\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_clear_configuration(command):
-    pattern = re.compile(r'^\s*clear_configuration\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CLEAR_CONFIGURATION_PATTERN.match(command)
     return bool(match)
 
+CARGO_DEPS_PATTERN = re.compile(r'^\s*cargo_deps\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_cargo_deps(command):
-    pattern = re.compile(r'^\s*cargo_deps\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CARGO_DEPS_PATTERN.match(command)
     return bool(match)
 
+MAVEN_DEPS_PATTERN = re.compile(r'^\s*maven_deps\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_maven_deps(command):
-    pattern = re.compile(r'^\s*maven_deps\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = MAVEN_DEPS_PATTERN.match(command)
     return bool(match)
 
+GRADLE_DEPS_PATTERN = re.compile(r'^\s*gradle_deps\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_gradle_deps(command):
-    pattern = re.compile(r'^\s*gradle_deps\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = GRADLE_DEPS_PATTERN.match(command)
     return bool(match)
 
+NPM_DEPS_PATTERN = re.compile(r'^\s*npm_deps\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_npm_deps(command):
-    pattern = re.compile(r'^\s*npm_deps\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = NPM_DEPS_PATTERN.match(command)
     return bool(match)
 
+GO_DEPS_PATTERN = re.compile(r'^\s*go_deps\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_go_deps(command):
-    pattern = re.compile(r'^\s*go_deps\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = GO_DEPS_PATTERN.match(command)
     return bool(match)
 
+NPM_BUILD_PATTERN = re.compile(r'^\s*npm_build\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_npm_build(command):
-    pattern = re.compile(r'^\s*npm_build\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = NPM_BUILD_PATTERN.match(command)
     return bool(match)
 
+MAVEN_BUILD_PATTERN = re.compile(r'^\s*maven_build\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_maven_build(command):
-    pattern = re.compile(r'^\s*maven_build\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = MAVEN_BUILD_PATTERN.match(command)
     return bool(match)
 
+GRADLE_BUILD_PATTERN = re.compile(r'^\s*gradle_build\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_gradle_build(command):
-    pattern = re.compile(r'^\s*gradle_build\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = GRADLE_BUILD_PATTERN.match(command)
     return bool(match)
 
+CARGO_BUILD_PATTERN = re.compile(r'^\s*cargo_build\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_cargo_build(command):
-    pattern = re.compile(r'^\s*cargo_build\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CARGO_BUILD_PATTERN.match(command)
     return bool(match)
 
+GO_BUILD_PATTERN = re.compile(r'^\s*go_build\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_go_build(command):
-    pattern = re.compile(r'^\s*go_build\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = GO_BUILD_PATTERN.match(command)
     return bool(match)
 
+CMAKE_BUILD_PATTERN = re.compile(r'^\s*cmake_build\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_cmake_build(command):
-    pattern = re.compile(r'^\s*cmake_build\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CMAKE_BUILD_PATTERN.match(command)
     return bool(match)
 
+JEST_TEST_PATTERN = re.compile(r'^\s*jest_test\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_jest_test(command):
-    pattern = re.compile(r'^\s*jest_test\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = JEST_TEST_PATTERN.match(command)
     return bool(match)
 
+JUNIT_TEST_PATTERN = re.compile(r'^\s*junit_test\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_junit_test(command):
-    pattern = re.compile(r'^\s*junit_test\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = JUNIT_TEST_PATTERN.match(command)
     return bool(match)
 
+CARGO_TEST_PATTERN = re.compile(r'^\s*cargo_test\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_cargo_test(command):
-    pattern = re.compile(r'^\s*cargo_test\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CARGO_TEST_PATTERN.match(command)
     return bool(match)
 
+GO_TEST_PATTERN = re.compile(r'^\s*go_test\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_go_test(command):
-    pattern = re.compile(r'^\s*go_test\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = GO_TEST_PATTERN.match(command)
     return bool(match)
 
 
+CHANGE_PYTHON_VERSION_PATTERN = re.compile(r'^\s*change_python_version\s+(\d+\.\d+(?:\.\d+)?)\s*$', re.IGNORECASE | re.MULTILINE)
+
 def match_change_python_version(command):
-    pattern = re.compile(r'^\s*change_python_version\s+(\d+\.\d+(?:\.\d+)?)\s*$', re.IGNORECASE | re.MULTILINE)
-    match = pattern.match(command)
+    match = CHANGE_PYTHON_VERSION_PATTERN.match(command)
     if match:
         return {"version": match.group(1)}
     return False
@@ -14,6 +14,10 @@
 
 
 import re
+
+# 更新后的正则表达式
+REQUIREMENT_PATTERN = re.compile(r'^([\w\-_\.]+(\[[\w\-,_\.]+\])?)\s*((?:[><=!~]{1,2}\s*[\d\w\.\-\+]+(?:\s*,\s*)?)*)$')
+
 # 功能：解析python依赖项
 # 输入：python依赖项，格式为package_name[version_constraints]
 # 输出：解析完成的元组，格式为(package_name, version_constraints)，如果没有写version_constraints，则为None，如果输入字符串格式错误，则package_name与version_constraints均为None
@@ -21,10 +25,7 @@ def parse_requirements(input_string):
     # 去除注释部分
     input_string = input_string.split('#')[0].strip()
     
-    # 更新后的正则表达式
-    pattern = r'^([\w\-_\.]+(\[[\w\-,_\.]+\])?)\s*((?:[><=!~]{1,2}\s*[\d\w\.\-\+]+(?:\s*,\s*)?)*)$'
-    
-    matches = re.match(pattern, input_string)
+    matches = REQUIREMENT_PATTERN.match(input_string)
     
     if matches:
         package_name = matches.group(1)
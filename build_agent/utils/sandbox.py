@@ -28,6 +28,9 @@ from download import download
 from outputcollector import OutputCollector
 from show_msg import show_msg
 
+# 测试文件名：test_开头或_test.py结尾
+TEST_FILE_NAME_PATTERN = re.compile(r'^test_|_test\.py$')
+
 # 这部分bash语句通常认为不会对于系统产生影响，如果下面safe_cmd打头，且不存在">"这样的重定向符，则不commit
 safe_cmd = [
     "cd", "ls", "cat", "echo", "pwd", "whoami", "who", "date", "cal", "df", "du",
@@ -46,15 +49,13 @@ def truncate_msg(result_message, command, truncate=2000, bar_truncate=20):
     lines = [x for x in lines if len(x.strip()) > 0]
     # 用来存疑似进度条的行数
     bar_lines = list()
-    for i in range(len(lines)):
-        line = lines[i]
-        if line.strip().startswith('\x1b[') or line.count('\x1b[') >= 2 or line.count('█') >= 2 or '━━━━━' in line:
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith('\x1b[') or line.count('\x1b[') >= 2 or line.count('█') >= 2 or '━━━━━' in line:
             bar_lines.append(i)
     if len(bar_lines) > bar_truncate:
-        for i in range(len(lines)):
-            if i in bar_lines[:-bar_truncate]:
-                lines[i] = ''
-    lines = [x for x in lines if len(x) > 0]
+        # 只保留最后bar_truncate行进度条，用set查找避免每行都扫一遍列表
+        dropped = set(bar_lines[:-bar_truncate])
+        lines = [x for i, x in enumerate(lines) if i not in dropped]
 
     result_message = '\n'.join(lines)
     res = result_message
@@ -62,9 +63,11 @@ def truncate_msg(result_message, command, truncate=2000, bar_truncate=20):
     if len(result_message) > truncate * 3:
         res = f"Running `{command}`...\nThe output is too long, so we've truncated it to show you the first and last 5000 characters.\n"
         res += (result_message[:truncate*3] + "\n...[Truncation]...\n" + result_message[-truncate*3:])
-    elif len(result_message.split(' ')) > truncate:
+    # 先数空格判断词数，超长时才真正split，且只split一次
+    elif result_message.count(' ') >= truncate:
+        words = result_message.split(' ')
         res = f"Running `{command}`...\nThe output is too long, so we've truncated it to show you the first and last 2500 words.\n"
-        res += (' '.join(result_message.split(' ')[:truncate]) + "\n...[Truncation]...\n" + ' '.join(result_message.split(' ')[-truncate:]))
+        res += (' '.join(words[:truncate]) + "\n...[Truncation]...\n" + ' '.join(words[-truncate:]))
     
     return res
 
@@ -113,6 +116,43 @@ class Sandbox:
         'cpp': ['.cpp', '.hpp', '.cc', '.hh', 'CMakeLists.txt', 'conanfile.txt'],
         'c': ['.c', '.h', 'Makefile']
     }
+    # str.endswith accepts a tuple, so each language is matched with a single call
+    LANGUAGE_SUFFIXES = {lang: tuple(extensions) for lang, extensions in LANGUAGE_EXTENSIONS.items()}
+    # VCS metadata, virtualenvs, caches and build output say nothing about the project's languages
+    SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '.venv', 'venv', '__pycache__', '.tox',
+                 '.mypy_cache', '.pytest_cache', 'dist', 'build', '.pipreqs'}
+    CONFIG_FILE_SUFFIXES = (
+        'requirements.txt', 'setup.py', 'pyproject.toml',  # Python
+        'package.json', 'tsconfig.json',                   # JavaScript
+        'pom.xml', 'build.gradle',                        # Java
+        'go.mod', 'Gopkg.toml',                          # Go
+        'Gemfile', 'Cargo.toml', 'composer.json'         # Others
+    )
+
+    # Default package manager for each language
+    DEFAULT_MANAGERS = {
+        'python': 'pip',
+        'javascript': 'npm',
+        'java': 'maven',
+        'go': 'go',
+        'ruby': 'bundler',
+        'php': 'composer',
+        'rust': 'cargo',
+        'csharp': 'dotnet',
+        'cpp': 'conan'
+    }
+
+    # Language-specific config files that select another manager, checked in order
+    MANAGER_CONFIG_FILES = {
+        'python': [('pyproject.toml', 'poetry'), ('Pipfile', 'pipenv')],
+        'javascript': [('package-lock.json', 'npm'), ('yarn.lock', 'yarn'), ('pnpm-lock.yaml', 'pnpm')],
+        'java': [('pom.xml', 'maven'), ('build.gradle', 'gradle')],
+        'go': [('Gopkg.toml', 'dep')],
+        'ruby': [('Gemfile', 'bundler')],
+        'php': [('composer.json', 'composer')],
+        'rust': [('Cargo.toml', 'cargo')],
+        'cpp': [('conanfile.txt', 'conan')]
+    }
 
     # Package manager commands for different languages
     PACKAGE_MANAGERS = {
@@ -164,6 +204,7 @@ class Sandbox:
         self.language_stats = {}  # Track language usage statistics
         self.language_managers = {}  # Store package managers for each detected language
         self.build_configs = {}  # Store build configurations for each language
+        self.root_files = set()  # File names at the repo root, recorded by detect_languages
     
     def generate_dockerfile(self):
         # Base universal Dockerfile content that supports multiple languages
@@ -177,7 +218,7 @@ bc \
 
 # Python environment setup with package managers
 RUN apt-get install -y python3-pip python3-dev
-RUN pip3 install pytest pipdeptree
+RUN pip3 install pytest pipdeptree wheel
 # Poetry installation
 RUN curl -sSL https://install.python-poetry.org
 ENV PATH="/root/.local/bin:$PATH"
@@ -387,18 +428,22 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
             repo_path = f'{self.root_path}/utils/repo/{self.full_name}/repo'
             language_files = {lang: [] for lang in self.LANGUAGE_EXTENSIONS.keys()}
             
-            for root, _, files in os.walk(repo_path):
+            for root, dirs, files in os.walk(repo_path):
+                if root == repo_path:
+                    # 顺便记下根目录文件，setup_package_managers直接查表
+                    self.root_files = set(files)
+                dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
                 for file in files:
                     file_path = os.path.join(root, file)
-                    for lang, extensions in self.LANGUAGE_EXTENSIONS.items():
-                        if any(file.endswith(ext) for ext in extensions):
+                    for lang, suffixes in self.LANGUAGE_SUFFIXES.items():
+                        if file.endswith(suffixes):
                             self.detected_languages.add(lang)
                             language_files[lang].append(file_path)
                             
                             # Check for build and config files
                             if file in ['pyproject.toml', 'setup.py', 'requirements.txt'] or file.endswith('.py'):
                                 self.build_configs['python'] = self.build_configs.get('python', file)
-                            elif file in ['package.json', 'tsconfig.json'] or any(file.endswith(ext) for ext in ['.js', '.jsx', '.ts', '.tsx']):
+                            elif file in ['package.json', 'tsconfig.json'] or file.endswith(('.js', '.jsx', '.ts', '.tsx')):
                                 self.build_configs['javascript'] = self.build_configs.get('javascript', file)
                             elif file in ['pom.xml', 'build.gradle'] or file.endswith('.java'):
                                 self.build_configs['java'] = self.build_configs.get('java', file)
@@ -406,7 +451,7 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                                 self.build_configs['go'] = self.build_configs.get('go', file)
                             elif file == 'Cargo.toml' or file.endswith('.rs'):
                                 self.build_configs['rust'] = self.build_configs.get('rust', file)
-                            elif file == 'CMakeLists.txt' or any(file.endswith(ext) for ext in ['.cpp', '.hpp', '.cc', '.hh']):
+                            elif file == 'CMakeLists.txt' or file.endswith(('.cpp', '.hpp', '.cc', '.hh')):
                                 self.build_configs['cpp'] = self.build_configs.get('cpp', file)
             
             # Calculate language statistics
@@ -415,15 +460,7 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                 lang: {
                     'files': len(files),
                     'percentage': (len(files) / total_files * 100) if total_files > 0 else 0,
-                    'config_files': [os.path.basename(f) for f in files if any(
-                        f.endswith(conf) for conf in [
-                            'requirements.txt', 'setup.py', 'pyproject.toml',  # Python
-                            'package.json', 'tsconfig.json',                   # JavaScript
-                            'pom.xml', 'build.gradle',                        # Java
-                            'go.mod', 'Gopkg.toml',                          # Go
-                            'Gemfile', 'Cargo.toml', 'composer.json'         # Others
-                        ]
-                    )]
+                    'config_files': [os.path.basename(f) for f in files if f.endswith(self.CONFIG_FILE_SUFFIXES)]
                 }
                 for lang, files in language_files.items() if len(files) > 0
             }
@@ -436,46 +473,12 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
     def setup_package_managers(self):
         """Set up package managers for all detected languages."""
         for lang in self.detected_languages:
-            # Get default package manager for the language
-            default_manager = {
-                'python': 'pip',
-                'javascript': 'npm',
-                'java': 'maven',
-                'go': 'go',
-                'ruby': 'bundler',
-                'php': 'composer',
-                'rust': 'cargo',
-                'csharp': 'dotnet',
-                'cpp': 'conan'
-            }.get(lang)
-            
-            # Check for language-specific config files
-            config_files = {
-                'pyproject.toml': ('python', 'poetry'),
-                'Pipfile': ('python', 'pipenv'),
-                'package-lock.json': ('javascript', 'npm'),
-                'yarn.lock': ('javascript', 'yarn'),
-                'pnpm-lock.yaml': ('javascript', 'pnpm'),
-                'pom.xml': ('java', 'maven'),
-                'build.gradle': ('java', 'gradle'),
-                'Gopkg.toml': ('go', 'dep'),
-                'Gemfile': ('ruby', 'bundler'),
-                'composer.json': ('php', 'composer'),
-                'Cargo.toml': ('rust', 'cargo'),
-                'conanfile.txt': ('cpp', 'conan')
-            }
-            
-            repo_path = f'{self.root_path}/utils/repo/{self.full_name}/repo'
-            manager_set = False
-            
-            for config_file, (config_lang, manager) in config_files.items():
-                if config_lang == lang and os.path.exists(os.path.join(repo_path, config_file)):
+            # Only probe the config files of this language, stop at the first one found
+            self.language_managers[lang] = self.DEFAULT_MANAGERS.get(lang)
+            for config_file, manager in self.MANAGER_CONFIG_FILES.get(lang, []):
+                if config_file in self.root_files:
                     self.language_managers[lang] = manager
-                    manager_set = True
                     break
-            
-            if not manager_set:
-                self.language_managers[lang] = default_manager
 
     def install_all_dependencies(self):
         """Install dependencies for all detected languages."""
@@ -597,14 +600,9 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
             cmd = f"chmod -R 777 {project_directory}/tools && docker cp {project_directory}/tools {self.container.name}:/home"
             subprocess.run(cmd, check=True, shell=True)
 
-            # Debug: Check source directory before copy
-            print(f"\033[93mChecking source directory...\033[0m")
-            source_path = f"{project_directory}/utils/repo/{self.full_name}/repo"
-            ls_source = subprocess.run(f"ls -la {source_path}", shell=True, capture_output=True, text=True)
-            print(f"\033[92mSource directory contents:\n{ls_source.stdout}\033[0m")
-
             # Copy repo directory
             print(f"\033[93mCopying repository to container...\033[0m")
+            source_path = f"{project_directory}/utils/repo/{self.full_name}/repo"
             repo_cmd = f"docker cp {source_path} {self.container.name}:/"
             result = subprocess.run(repo_cmd, shell=True, capture_output=True, text=True)
             
@@ -612,11 +610,11 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                 print(f"\033[92mRepository copy successful!\033[0m")
             else:
                 print(f"\033[91mRepository copy failed: {result.stderr}\033[0m")
-
-            # Debug: Check destination directory after copy
-            print(f"\033[93mVerifying /repo contents in container...\033[0m")
-            ls_dest = subprocess.run(f"docker exec {self.container.name} ls -la /repo", shell=True, capture_output=True, text=True)
-            print(f"\033[92mContainer /repo contents:\n{ls_dest.stdout}\033[0m")
+                # Debug: 只有拷贝失败时才列出源目录和容器内/repo，成功时省掉两次子进程
+                ls_source = subprocess.run(f"ls -la {source_path}", shell=True, capture_output=True, text=True)
+                print(f"\033[92mSource directory contents:\n{ls_source.stdout}\033[0m")
+                ls_dest = subprocess.run(f"docker exec {self.container.name} ls -la /repo", shell=True, capture_output=True, text=True)
+                print(f"\033[92mContainer /repo contents:\n{ls_dest.stdout}\033[0m")
 
             return 1
         except Exception as e:
@@ -679,7 +677,7 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                     self.sandbox.shell.sendline(command)
                     self.sandbox.commands[-1]["returncode"] = -1
 
-                self.sandbox.shell.expect([r'root@.*:.*# '], timeout=600)  # 等待bash提示符，带超时
+                self.sandbox.shell.expect([r'root@.*:.*# '], timeout=timeout)  # 等待bash提示符，带超时
                 end_time = time.time()
                 elasped_time = end_time - start_time
                 self.sandbox.commands[-1]["time"] = elasped_time
@@ -698,9 +696,10 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                     if id != -1 and len(last_line[:id].strip()) > 0:
                         output_lines.append(last_line[:id].strip())
                 res = '\n'.join(output_lines).strip()
-                if len(res.split(' ')) > 5000:
-                    res = "The output is too long, so we've truncated it to show you the first and last 2500 words."
-                    res += (' '.join(res.split(' ')[:2500]) + '\n' + ' '.join(res.splitlines()[-2500:]))
+                if res.count(' ') >= 5000:
+                    words = res.split(' ')
+                    res = "The output is too long, so we've truncated it to show you the first and last 2500 words.\n"
+                    res += (' '.join(words[:2500]) + '\n' + ' '.join(words[-2500:]))
                 return_code = self.get_returncode()
                 self.sandbox.commands[-1]['returncode'] = return_code
                 if str(return_code) == '0':
@@ -752,14 +751,18 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                                 output_lines.append(last_line[:id].strip())
                         return output_lines[0], 0
 
+                    # 带参数的指令只解析一次，后面直接复用解析结果
+                    conflict_solve_args = match_conflict_solve(command)
+                    waitinglist_add_args = match_waitinglist_add(command)
+                    waitinglist_addfile_args = match_waitinglist_addfile(command)
                     if match_download(command):
                         with OutputCollector() as collector:
                             download(self, waiting_list, conflict_list)
                         result_message = f'Running `{command}`...\n' + collector.get_output() + '\n'
                         return truncate_msg(result_message, 'download'), 'unknown'
-                    elif match_conflict_solve(command) != -1:
-                        version_constraint = match_conflict_solve(command)['version_constraint']
-                        unchanged = match_conflict_solve(command)['unchanged']
+                    elif conflict_solve_args != -1:
+                        version_constraint = conflict_solve_args['version_constraint']
+                        unchanged = conflict_solve_args['unchanged']
                         with OutputCollector() as collector:
                             conflict_list.solve(waiting_list, version_constraint, unchanged)
                         result_message = f'Running `{command}`...\n' + collector.get_output() + '\n'
@@ -769,16 +772,16 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                             conflict_list.clear()
                         result_message = f'Running `{command}`...\n' + collector.get_output() + '\n'
                         return truncate_msg(result_message, command), 'unknown'
-                    elif match_waitinglist_add(command) != -1:
-                        package_name = match_waitinglist_add(command)['package_name']
-                        version_constraints = match_waitinglist_add(command)['version_constraints']
-                        tool = match_waitinglist_add(command)['tool']
+                    elif waitinglist_add_args != -1:
+                        package_name = waitinglist_add_args['package_name']
+                        version_constraints = waitinglist_add_args['version_constraints']
+                        tool = waitinglist_add_args['tool']
                         with OutputCollector() as collector:
                             waiting_list.add(package_name, version_constraints, tool, conflict_list)
                         result_message = f'Running `{command}`...\n' + collector.get_output() + '\n'
                         return truncate_msg(result_message, command), 'unknown'
-                    elif match_waitinglist_addfile(command) != -1:
-                        file_path = match_waitinglist_addfile(command)['file_path']
+                    elif waitinglist_addfile_args != -1:
+                        file_path = waitinglist_addfile_args['file_path']
                         current_file_path = os.path.abspath(__file__)
                         current_directory = os.path.dirname(current_file_path)
                         project_directory = os.path.dirname(current_directory)
@@ -811,11 +814,11 @@ RUN update-alternatives --install /usr/bin/java java $JAVA_HOME/bin/java 20000 \
                         msg = 'Please do not use `pytest` directly, but use `runtest` or `poetryruntest`(When you configured in poetry environment) instead. If there are something wrong when running `runtest` or `poetryruntest`, please solve it and run it again!'
                         result_message = msg
                         return result_message, 1
-                    elif command.split(' ')[0] == 'rm' and (command.split('/')[-1].startswith('test_') or command.split('/')[-1].endswith('_test.py')):
+                    elif command.split(' ')[0] == 'rm' and TEST_FILE_NAME_PATTERN.search(command.split('/')[-1]):
                         msg = 'Please do not directly delete the testing file to pass the test!'
                         result_message = msg
                         return result_message, 1
-                    elif command.split(' ')[0] == 'mv' and (command.split('/')[-1].startswith('test_') or command.split('/')[-1].endswith('_test.py')):
+                    elif command.split(' ')[0] == 'mv' and TEST_FILE_NAME_PATTERN.search(command.split('/')[-1]):
                         msg = 'Please do not directly move the testing file to pass the test!'
                         result_message = msg
                         return result_message, 1
@@ -1051,7 +1054,7 @@ Explanation: Clear all the items in the waiting list.'''
 
             def edit(self, edit_tmp_file:str, project_path:str, file_path = None, start_line = 0, end_line = 0, timeout=600):
                 if file_path:
-                    if file_path.split('/')[-1].startswith('test_') or file_path('/')[-1].endswith('_test.py'):
+                    if TEST_FILE_NAME_PATTERN.search(file_path.split('/')[-1]):
                         msg = f'Running Edit...\n' + f'You are trying to modify file {file_path}, but we require that you should not modify the testing files. Please consider alternative solutions.' + '\n'
                         return msg, 1
                 if not file_path:
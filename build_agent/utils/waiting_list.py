@@ -92,24 +92,32 @@ class WaitingList(EasyList):
         if os.path.isdir(file_path):
             print(f'Error, the path {file_path} is not a file, but a directory!')
             return False
-        with open(file_path, 'r') as r1:
-            items = r1.readlines()
         successful_res = list()
         conflict_res = list()
+        seen = set()
 
-        for item in items:
-            item = item.split('#')[0].strip()
-            if len(item.strip()) > 0 and len(item) > 0:
-                package_name, version_constraints = parse_requirements(item)
-                if package_name:
-                    res = self.add(package_name, version_constraints, 'pip', conflict_list)
-                    if res:
-                        successful_res.append(item)
-                    else:
-                        conflict_res.append(item)
-                # else:
-                #     errorformat_list.add(item)
-                #     errorformat_res.append(item)
+        # 逐行读取，不把整个文件读进内存
+        with open(file_path, 'r') as r1:
+            for item in r1:
+                item = item.split('#')[0].strip()
+                # pip选项、url和本地路径不是<package_name><version_constraints>格式，不用再走正则
+                if item.startswith(('-', 'http://', 'https://', 'git+', 'file:')):
+                    continue
+                # 完全相同的条目只解析一次，不当作冲突
+                if item in seen:
+                    continue
+                seen.add(item)
+                if len(item.strip()) > 0 and len(item) > 0:
+                    package_name, version_constraints = parse_requirements(item)
+                    if package_name:
+                        res = self.add(package_name, version_constraints, 'pip', conflict_list)
+                        if res:
+                            successful_res.append(item)
+                        else:
+                            conflict_res.append(item)
+                    # else:
+                    #     errorformat_list.add(item)
+                    #     errorformat_res.append(item)
         file_path = '/' + '/'.join(file_path.split('/')[-2:])
         if len(successful_res) > 0:
             print(f'The following entries in "{file_path}" have been successfully added to the waiting list:')